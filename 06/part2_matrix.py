@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+from typing import Iterable
+
+from part2 import _step, get_data, render_result
+
+# Matrix[i][j] is how many fish with timer j one fish with timer i becomes after a day
+Matrix = list[list[int]]
+
+
+def transition_matrix() -> Matrix:
+    return [list(_step(timer)) for timer in range(9)]
+
+
+def _matrix_multiply(a: Matrix, b: Matrix) -> Matrix:
+    """_matrix_multiply computes a @ b"""
+    columns = list(zip(*b))
+    return [
+        [sum(x * y for x, y in zip(row, column)) for column in columns] for row in a
+    ]
+
+
+def _vector_multiply(state: list[int], matrix: Matrix) -> list[int]:
+    """_vector_multiply computes state @ matrix for the row vector state"""
+    return [sum(x * y for x, y in zip(state, column)) for column in zip(*matrix)]
+
+
+class TransitionPowers:
+    """TransitionPowers caches the transition matrix raised to successive powers of two
+
+    A query for day N only multiplies the initial counts by the cached powers for the
+    set bits of N, so once the powers exist each query is O(log N) vector products.
+    """
+
+    def __init__(self, matrix: Matrix | None = None):
+        # powers[k] is matrix ** (2 ** k)
+        self.powers: list[Matrix] = [matrix or transition_matrix()]
+
+    def power(self, bit: int) -> Matrix:
+        while len(self.powers) <= bit:
+            last = self.powers[-1]
+            self.powers.append(_matrix_multiply(last, last))
+        return self.powers[bit]
+
+    def population(self, initial_counts: list[int], days: int) -> list[int]:
+        """population computes the timer counts after the given number of days
+
+        Args:
+            initial_counts (list[int]): The number of fish with each timer value 0-8
+            days (int): The number of days to simulate
+
+        Returns:
+            list[int]: The number of fish with each timer value after days
+        """
+        state = list(initial_counts)
+        bit = 0
+        while days:
+            if days & 1:
+                # Powers of the same matrix commute, so the order doesn't matter
+                state = _vector_multiply(state, self.power(bit))
+            days >>= 1
+            bit += 1
+        return state
+
+    def batch(self, queries: Iterable[tuple[list[int], int]]) -> list[list[int]]:
+        """batch answers many (initial_counts, days) queries against the cached powers"""
+        return [self.population(counts, days) for counts, days in queries]
+
+
+# Shared so repeated calls to process_data reuse the squarings
+TRANSITION_POWERS = TransitionPowers()
+
+
+def initial_counts(data: Iterable[int]) -> list[int]:
+    state = [0] * 9
+    for d in data:
+        state[d] += 1
+    return state
+
+
+def process_data(data: Iterable[int], steps: int = 256) -> list[int]:
+    # Applying the transition steps times is the same as applying its steps-th power once
+    return TRANSITION_POWERS.population(initial_counts(data), steps)
+
+
+def main():
+    fname = "input.txt"
+    fname = "sample.txt"
+    data = get_data(fname)
+    result = process_data(data)
+    render_result(result)
+    # sample -> 26984457539
+    # input -> 1572358335990
+
+
+if __name__ == "__main__":
+    main()
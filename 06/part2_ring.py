@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+
+from time import perf_counter
+from typing import Iterable
+
+from part2 import get_data, render_result
+import part2_matrix
+
+
+def process_data(
+    data: Iterable[int], steps: int = 256, verbose: bool = False
+) -> list[int]:
+    """process_data simulates the timers in place in a ring of 9 buckets
+
+    The bucket holding timer t is ring[(zero + t) % 9]. Advancing zero by one ages every
+    fish at once, and the fish that were at timer 0 end up in the timer 8 slot, which is
+    exactly where their newborns belong. That leaves adding the parents back in at timer 6.
+
+    Args:
+        data (Iterable[int]): The initial timer of each fish
+        steps (int, optional): The number of days to simulate. Defaults to 256.
+        verbose (bool, optional): Print the state after every day. Defaults to False.
+
+    Returns:
+        list[int]: The number of fish with each timer value after steps days
+    """
+    ring = [0] * 9
+    for d in data:
+        ring[d] += 1
+
+    zero = 0
+    for s in range(steps):
+        # The old timer 7 bucket becomes the new timer 6 bucket
+        ring[(zero + 7) % 9] += ring[zero]
+        zero += 1
+        if zero == 9:
+            zero = 0
+        if verbose:
+            print(f"{s=} state={_unroll(ring, zero)}")
+
+    return _unroll(ring, zero)
+
+
+def _unroll(ring: list[int], zero: int) -> list[int]:
+    """_unroll lists the ring in timer order"""
+    return ring[zero:] + ring[:zero]
+
+
+def benchmark(fname: str, horizons: Iterable[int]) -> None:
+    initial_timers = list(get_data(fname))
+    for steps in horizons:
+        start = perf_counter()
+        ring_result = process_data(initial_timers, steps)
+        ring_elapsed = perf_counter() - start
+
+        start = perf_counter()
+        # Fresh powers each time so the matrix side isn't helped by earlier horizons
+        matrix_result = part2_matrix.TransitionPowers().population(
+            part2_matrix.initial_counts(initial_timers), steps
+        )
+        matrix_elapsed = perf_counter() - start
+
+        assert ring_result == matrix_result
+        print(f"{steps=} {ring_elapsed=:.4f}s {matrix_elapsed=:.4f}s")
+
+
+def main():
+    fname = "input.txt"
+    fname = "sample.txt"
+    data = get_data(fname)
+    result = process_data(data)
+    render_result(result)
+    # sample -> 26984457539
+    # input -> 1572358335990
+
+    benchmark(fname, [80, 256, 10_000, 100_000])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+from typing import NamedTuple
+
+
+class CostCurves(NamedTuple):
+    # The target position of the first entry in each curve
+    start: int
+    # linear[i] is the constant rate fuel cost of moving every crab to start + i
+    linear: list[int]
+    # triangular[i] is the increasing rate fuel cost of moving every crab to start + i
+    triangular: list[int]
+
+    def best(self, curve: list[int]) -> tuple[int, int]:
+        """best finds the lowest position with the minimum cost on the curve
+
+        Args:
+            curve (list[int]): Either self.linear or self.triangular
+
+        Returns:
+            tuple[int, int]: The best position and its cost
+        """
+        min_cost = min(curve)
+        return self.start + curve.index(min_cost), min_cost
+
+
+def cost_curves(position_weights: dict[int, int]) -> CostCurves:
+    """cost_curves evaluates both fuel costs at every target between the outermost crabs
+
+    With W, S and Q the total weight, weight * x and weight * x ** 2 of the crabs,
+    and the same prefix sums W_le and S_le over crabs at or left of the target t:
+        linear(t) = t * W_le - S_le + (S - S_le) - t * (W - W_le)
+        triangular(t) = (t ** 2 * W - 2 * t * S + Q + linear(t)) / 2
+    Sorting the positions once and sweeping t left to right keeps the prefix sums
+    current, so the whole curve takes O(n log n + range).
+
+    Args:
+        position_weights (dict[int, int]): The number of crabs at each position
+
+    Returns:
+        CostCurves: The linear and triangular cost of every target position
+    """
+    positions = sorted(position_weights)
+    total_weight = sum(position_weights.values())
+    total_moment = sum(x * w for x, w in position_weights.items())
+    total_square = sum(x * x * w for x, w in position_weights.items())
+
+    linear: list[int] = []
+    triangular: list[int] = []
+    weight_le = 0
+    moment_le = 0
+    index = 0
+    for target in range(positions[0], positions[-1] + 1):
+        # Pull in the crabs that are now at or left of the target
+        while index < len(positions) and positions[index] <= target:
+            weight = position_weights[positions[index]]
+            weight_le += weight
+            moment_le += weight * positions[index]
+            index += 1
+
+        linear_cost = (
+            target * weight_le
+            - moment_le
+            + (total_moment - moment_le)
+            - target * (total_weight - weight_le)
+        )
+        square_cost = target * target * total_weight - 2 * target * total_moment
+        square_cost += total_square
+        linear.append(linear_cost)
+        triangular.append((square_cost + linear_cost) // 2)
+
+    return CostCurves(positions[0], linear, triangular)
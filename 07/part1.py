@@ -16,9 +16,46 @@ def get_data(fname: str) -> Iterable[int]:
         return (int(x) for x in raw_data.read().split(","))
 
 
-def process_data(data: Iterable[int]) -> ResultSet:
+def process_data(data: Iterable[int], verify: bool = False) -> ResultSet:
     position_counts = Counter(data)
 
+    # The linear cost is minimized at the weighted median
+    best_position = weighted_median(position_counts)
+    result = ResultSet(best_position, cost(position_counts, best_position))
+
+    if verify:
+        # Double check against the exhaustive scan, which may land on a different
+        # position when several share the minimum cost
+        expected = _process_data_brute_force(position_counts)
+        assert result.cost == expected.cost, f"{result=} {expected=}"
+
+    print(best_position)
+
+    return result
+
+
+def weighted_median(position_counts: dict[int, int]) -> int:
+    """weighted_median finds the lowest position with at least half the weight at or below it
+
+    Moving the target past it would move more crabs away than closer, so no other
+    position is cheaper, and positions below it are strictly more expensive.
+
+    Args:
+        position_counts (dict[int, int]): The number of crabs at each position
+
+    Returns:
+        int: The lower weighted median position
+    """
+    total = sum(position_counts.values())
+    running = 0
+    for position in sorted(position_counts):
+        running += position_counts[position]
+        if 2 * running >= total:
+            return position
+    raise ValueError("weighted_median of no positions")
+
+
+def _process_data_brute_force(position_counts: dict[int, int]) -> ResultSet:
     min_position = min(position_counts.keys())
     max_position = max(position_counts.keys())
 
@@ -31,8 +68,6 @@ def process_data(data: Iterable[int]) -> ResultSet:
             min_cost = position_cost
             best_position = p
 
-    print(best_position)
-
     return ResultSet(best_position, min_cost)
 
 
@@ -49,7 +84,7 @@ def main():
     fname = "input.txt"
     # fname = "sample.txt"
     data = get_data(fname)
-    result = process_data(data)
+    result = process_data(data, verify=True)
 
     render_result(result)
     # sample -> ResultSet(position=2, cost=37)
@@ -3,6 +3,8 @@
 import os
 from typing import Counter, Iterable, NamedTuple
 
+from cost_curve import cost_curves
+
 
 class ResultSet(NamedTuple):
     position: int
@@ -16,9 +18,47 @@ def get_data(fname: str) -> Iterable[int]:
         return (int(x) for x in raw_data.read().split(","))
 
 
-def process_data(data: Iterable[int]) -> ResultSet:
+def process_data(data: Iterable[int], verify: bool = False) -> ResultSet:
     position_weights = Counter(data)
 
+    result = _process_data_convex(position_weights)
+
+    if verify:
+        # Double check against the prefix sum curve and the exhaustive scan, which may
+        # land on a different position when several share the minimum cost
+        curves = cost_curves(position_weights)
+        from_curve = ResultSet(*curves.best(curves.triangular))
+        expected = _process_data_brute_force(position_weights)
+        assert result == from_curve, f"{result=} {from_curve=}"
+        assert result.cost == expected.cost, f"{result=} {expected=}"
+
+    print(result.position)
+
+    return result
+
+
+def _process_data_convex(position_weights: dict[int, int]) -> ResultSet:
+    """_process_data_convex only checks the handful of targets next to the weighted mean
+
+    The cost is convex and its slope at t is sum(weight * (t - x + sign(t - x) / 2)),
+    so the real valued minimum lies within 1/2 of the weighted mean.
+    The integer minimum is the floor or ceiling of that, which is always within
+    [floor(mean) - 1, floor(mean) + 2].
+    """
+    total_weight = sum(position_weights.values())
+    mean_floor = (
+        sum(position * weight for position, weight in position_weights.items())
+        // total_weight
+    )
+    candidates = range(
+        max(min(position_weights), mean_floor - 1),
+        min(max(position_weights), mean_floor + 2) + 1,
+    )
+    min_cost, best_position = min((cost(position_weights, p), p) for p in candidates)
+    return ResultSet(best_position, min_cost)
+
+
+def _process_data_brute_force(position_weights: dict[int, int]) -> ResultSet:
     min_position = min(position_weights.keys())
     max_position = max(position_weights.keys())
 
@@ -31,8 +71,6 @@ def process_data(data: Iterable[int]) -> ResultSet:
             min_cost = position_cost
             best_position = p
 
-    print(best_position)
-
     return ResultSet(best_position, min_cost)
 
 
@@ -58,7 +96,7 @@ def main():
     fname = "input.txt"
     # fname = "sample.txt"
     data = get_data(fname)
-    result = process_data(data)
+    result = process_data(data, verify=True)
 
     render_result(result)
     # sample -> ResultSet(position=5, cost=168)
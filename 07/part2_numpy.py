@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import os
+
+import numpy as np
+
+from cost_curve import cost_curves
+from part2 import ResultSet, render_result
+
+# Cap on the (targets x positions) block evaluated at once, about 32MB of int64
+MAX_BLOCK_ELEMENTS = 1 << 22
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+def get_data(fname: str) -> np.ndarray:
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fpath = os.path.join(dir_path, fname)
+    with open(fpath) as raw_data:
+        return np.array(raw_data.read().split(","), dtype=np.int64)
+
+
+def _max_cost(positions: np.ndarray, weights: np.ndarray, targets: np.ndarray) -> int:
+    """_max_cost bounds every cost on the curve, and the intermediate d * (d + 1)"""
+    # Python ints so the bound itself can't wrap
+    low = min(int(positions.min()), int(targets.min()))
+    high = max(int(positions.max()), int(targets.max()))
+    span = high - low
+    return max(int(weights.sum()) * span * (span + 1) // 2, span * (span + 1))
+
+
+def cost_curve(
+    positions: np.ndarray,
+    weights: np.ndarray,
+    targets: np.ndarray,
+    max_block_elements: int = MAX_BLOCK_ELEMENTS,
+) -> np.ndarray:
+    """cost_curve evaluates the increasing rate fuel cost at every target
+
+    Targets are broadcast against the positions a block at a time, sized so no
+    intermediate array has more than max_block_elements entries.
+
+    Everything is computed in int64, so the total weight times the triangular cost
+    of the widest distance between a target and a position, W * d * (d + 1) / 2,
+    has to fit in an int64 (about 9.2e18). Larger inputs raise OverflowError
+    instead of silently wrapping.
+
+    Args:
+        positions (np.ndarray): The distinct crab positions
+        weights (np.ndarray): The number of crabs at each of the positions
+        targets (np.ndarray): The target positions to evaluate
+        max_block_elements (int, optional): The peak block size. Defaults to MAX_BLOCK_ELEMENTS.
+
+    Returns:
+        np.ndarray: The cost of moving every crab to each target
+
+    Raises:
+        OverflowError: If the costs could exceed the int64 range
+    """
+    if _max_cost(positions, weights, targets) > INT64_MAX:
+        raise OverflowError("fuel costs could exceed the int64 range")
+    result = np.empty(len(targets), dtype=np.int64)
+    chunk_size = max(1, max_block_elements // len(positions))
+    for start in range(0, len(targets), chunk_size):
+        block = targets[start : start + chunk_size]
+        distance = np.abs(block[:, np.newaxis] - positions[np.newaxis, :])
+        # Each step costs one more than the last, so d steps cost d * (d + 1) / 2
+        result[start : start + len(block)] = (distance * (distance + 1) // 2) @ weights
+    return result
+
+
+def process_data(data: np.ndarray) -> ResultSet:
+    positions, weights = np.unique(data, return_counts=True)
+    targets = np.arange(positions[0], positions[-1] + 1)
+
+    try:
+        curve = cost_curve(positions, weights.astype(np.int64), targets)
+    except OverflowError:
+        # Too big for int64, fall back to the exact prefix-sum sweep over Python ints
+        curves = cost_curves(dict(zip(positions.tolist(), weights.tolist())))
+        return ResultSet(*curves.best(curves.triangular))
+    # argmin returns the first minimum, i.e. the lowest best position
+    best_index = int(np.argmin(curve))
+
+    return ResultSet(int(targets[best_index]), int(curve[best_index]))
+
+
+def main():
+    fname = "input.txt"
+    # fname = "sample.txt"
+    data = get_data(fname)
+    result = process_data(data)
+
+    render_result(result)
+    # sample -> ResultSet(position=5, cost=168)
+    # input -> ResultSet(position=488, cost=101618069)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+
+import operator
+import os
+from array import array
+from functools import reduce
+
+# Basins are bounded by walls of height 9
+WALL = 9
+# Maps the ASCII digits onto their values
+DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+
+
+class HeightMap:
+    """HeightMap stores the heights in one bytes object addressed by row_id * width + col_id"""
+
+    def __init__(self, heights: bytes, height: int, width: int):
+        self.heights = heights
+        self.height = height
+        self.width = width
+
+
+def get_data(fname: str) -> HeightMap:
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    fpath = os.path.join(dir_path, fname)
+    with open(fpath, "rb") as raw_data:
+        rows = [line.strip() for line in raw_data if line.strip()]
+    return HeightMap(b"".join(rows).translate(DIGITS), len(rows), len(rows[0]))
+
+
+def _find(parent: array, node: int) -> int:
+    # Path halving, point every other node on the way up at its grandparent
+    while parent[node] != node:
+        parent[node] = parent[parent[node]]
+        node = parent[node]
+    return node
+
+
+def basin_sizes(data: HeightMap) -> array:
+    """basin_sizes labels every basin with union-find in a single raster pass
+
+    Each non-wall cell is joined with its left and upper neighbors when they aren't
+    walls, which is enough to connect every basin since the right and lower neighbors
+    join it from their side.
+
+    Args:
+        data (HeightMap): The heights
+
+    Returns:
+        array: The size of each basin, in no particular order
+    """
+    heights = data.heights
+    width = data.width
+    parent = array("q", range(len(heights)))
+
+    for index, value in enumerate(heights):
+        if value == WALL:
+            continue
+        if index % width and heights[index - 1] != WALL:
+            root, other = _find(parent, index), _find(parent, index - 1)
+            if root != other:
+                parent[root] = other
+        if index >= width and heights[index - width] != WALL:
+            root, other = _find(parent, index), _find(parent, index - width)
+            if root != other:
+                parent[root] = other
+
+    # Second pass, tally each cell under its root
+    sizes = array("q", [0]) * len(heights)
+    for index, value in enumerate(heights):
+        if value != WALL:
+            sizes[_find(parent, index)] += 1
+    return array("q", (size for size in sizes if size))
+
+
+def process_data(data: HeightMap) -> int:
+    top_3 = sorted(basin_sizes(data))[-3:]
+    print(top_3)
+    return reduce(operator.__mul__, top_3, 1)
+
+
+def render_result(result: int):
+    print(result)
+
+
+def main():
+    fname = "input.txt"
+    # fname = "sample.txt"
+    # fname = "big_data.txt"
+    data = get_data(fname)
+    result = process_data(data)
+    render_result(result)
+    # sample -> 1134
+    # input -> 899392
+
+
+if __name__ == "__main__":
+    main()
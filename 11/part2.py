@@ -2,10 +2,14 @@
 
 import os
 from collections import deque
+from array import array
 from contextlib import contextmanager
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Iterable, Iterator, Set
 
+from util import NEIGHBOR_OFFSETS_8, NO_NEIGHBOR, neighbor_table
+
 
 @dataclass()
 class DataPoint:
@@ -61,18 +65,22 @@ class DataType:
         if p.row_id + 1 < len(self.data):
             yield self.data[p.row_id + 1][p.col_id]
 
+    @cached_property
+    def points(self) -> list[DataPoint]:
+        """Every DataPoint, addressed by row_id * width + col_id"""
+        return [point for row in self.data for point in row]
+
+    @cached_property
+    def neighbor_indexes(self) -> array:
+        # Works for any height x width, not just square grids
+        return neighbor_table(len(self.data), len(self.data[0]))
+
     def all_neighbors(self, p: DataPoint) -> Iterable[DataPoint]:
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                if i == j == 0:
-                    continue
-                row_id = p.row_id + i
-                col_id = p.col_id + j
-                if row_id < 0 or row_id >= len(self.data):
-                    continue
-                if col_id < 0 or col_id >= len(self.data):
-                    continue
-                yield self.data[row_id][col_id]
+        points = self.points
+        first = (p.row_id * len(self.data[0]) + p.col_id) * len(NEIGHBOR_OFFSETS_8)
+        for index in self.neighbor_indexes[first : first + len(NEIGHBOR_OFFSETS_8)]:
+            if index != NO_NEIGHBOR:
+                yield points[index]
 
     def step(self) -> int:
         seen: set[DataPoint] = set()
@@ -121,7 +129,8 @@ def get_data(fname: str) -> Iterator[DataType]:
 def process_data(data: DataType) -> int:
     r = 0
     count = 0
-    while r < 100:
+    # Keep going until every octopus flashes in the same step
+    while r < len(data.points):
         r = data.step()
         count += 1
     # r = sum(data.step() for _ in range(100))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+import random
+from time import perf_counter
+from typing import Callable
+
+from part2 import DataPoint, DataType
+from part2_flat import FlatGrid
+from part2_numpy import NumpyGrid
+
+# Wide, tall and square shapes so any row/column mixup shows up as a mismatch
+SHAPES = [(10, 200), (200, 10), (45, 45), (100, 400)]
+STEPS = 20
+
+
+def random_data(height: int, width: int, seed: int = 0) -> DataType:
+    rng = random.Random(seed)
+    return DataType(
+        data=[
+            [DataPoint(rng.randint(0, 9), row_id, col_id) for col_id in range(width)]
+            for row_id in range(height)
+        ]
+    )
+
+
+def _time_steps(step: Callable[[], int]) -> tuple[list[int], float]:
+    start = perf_counter()
+    flashes = [step() for _ in range(STEPS)]
+    return flashes, perf_counter() - start
+
+
+def benchmark(height: int, width: int) -> None:
+    data = random_data(height, width)
+    flat = FlatGrid.from_data(data)
+    vectorized = NumpyGrid.from_data(data)
+
+    results = {
+        "data_type": _time_steps(data.step),
+        "flat": _time_steps(flat.step),
+        "numpy": _time_steps(vectorized.step),
+    }
+
+    expected, _ = results["data_type"]
+    for name, (flashes, elapsed) in results.items():
+        assert flashes == expected, f"{name} disagrees on {height}x{width}"
+        print(f"{height}x{width} {name} {elapsed / STEPS * 1000:.2f}ms/step")
+    assert str(data) == str(flat) == str(vectorized)
+
+
+def main():
+    for height, width in SHAPES:
+        benchmark(height, width)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+from hashlib import blake2b
+
+from util import NEIGHBOR_OFFSETS_8, NO_NEIGHBOR, neighbor_table
+
+from part2 import DataType, get_data, render_result
+
+# Byte translation tables that touch every cell in a single C-level pass
+INCREMENT = bytes((value + 1) % 256 for value in range(256))
+RESET_FLASHED = bytes(0 if value > 9 else value for value in range(256))
+FLASH_ENERGY = 10
+# Slots per cell in the neighbor table
+STRIDE = len(NEIGHBOR_OFFSETS_8)
+
+
+class FlatGrid:
+    """FlatGrid keeps the energy levels in one bytearray addressed by row_id * width + col_id
+
+    A cell flashes exactly when its energy goes from 9 to 10, and energy only rises
+    during a step, so the cells above 9 double as the flashed mask and a flashed cell
+    is never queued twice.
+
+    Interior cells reach their neighbors through fixed index deltas, only the cells on
+    the edge of the grid look theirs up in the neighbor table.
+    """
+
+    def __init__(self, energy: bytes, height: int, width: int):
+        self.energy = bytearray(energy)
+        self.height = height
+        self.width = width
+        self.neighbors = neighbor_table(height, width)
+        self.deltas = tuple(
+            row_step * width + col_step for row_step, col_step in NEIGHBOR_OFFSETS_8
+        )
+        # edge[i] is 1 when cell i has a neighbor slot off the grid
+        edge = bytearray(height * width)
+        edge[:width] = edge[-width:] = b"\x01" * width
+        edge[::width] = edge[width - 1 :: width] = b"\x01" * height
+        self.edge = edge
+
+    @classmethod
+    def from_data(cls, data: DataType) -> "FlatGrid":
+        energy = bytes(point.value for row in data.data for point in row)
+        return cls(energy, len(data.data), len(data.data[0]))
+
+    def step(self) -> int:
+        energy = self.energy.translate(INCREMENT)
+        neighbors = self.neighbors
+        deltas = self.deltas
+        edge = self.edge
+
+        # Seed the cascade with every cell the global increment pushed to 10
+        frontier: list[int] = []
+        index = energy.find(FLASH_ENERGY)
+        while index >= 0:
+            frontier.append(index)
+            index = energy.find(FLASH_ENERGY, index + 1)
+
+        flashes = 0
+        while frontier:
+            point = frontier.pop()
+            flashes += 1
+            if edge[point]:
+                for neighbor in neighbors[point * STRIDE : (point + 1) * STRIDE]:
+                    if neighbor == NO_NEIGHBOR:
+                        continue
+                    energy[neighbor] += 1
+                    if energy[neighbor] == FLASH_ENERGY:
+                        frontier.append(neighbor)
+            else:
+                for delta in deltas:
+                    neighbor = point + delta
+                    energy[neighbor] += 1
+                    if energy[neighbor] == FLASH_ENERGY:
+                        frontier.append(neighbor)
+
+        self.energy = energy.translate(RESET_FLASHED)
+        return flashes
+
+    def __str__(self) -> str:
+        width = self.width
+        return "\n".join(
+            "".join(map(str, self.energy[row_id * width : (row_id + 1) * width]))
+            for row_id in range(self.height)
+        )
+
+
+def process_data(data: FlatGrid) -> int:
+    count = 1
+    while data.step() < len(data.energy):
+        count += 1
+    print(data)
+    return count
+
+
+def total_flashes(data: FlatGrid, steps: int) -> int:
+    """total_flashes counts the flashes over the given steps, fast-forwarding through cycles
+
+    The energy bytes are the whole state, so once a state repeats everything after it
+    repeats with the same period. Each state is remembered by a 16 byte digest.
+    data is left at the first repeated state (or after steps if none turns up).
+
+    Args:
+        data (FlatGrid): The starting grid
+        steps (int): The number of steps to count over
+
+    Returns:
+        int: The total number of flashes
+    """
+    # The step each state digest was first seen at
+    seen: dict[bytes, int] = {}
+    # flashes[i] is the total over the first i steps
+    flashes = [0]
+    for step_id in range(steps):
+        digest = blake2b(data.energy, digest_size=16).digest()
+        if digest in seen:
+            start = seen[digest]
+            period = step_id - start
+            cycle_flashes = flashes[step_id] - flashes[start]
+            cycles, rest = divmod(steps - step_id, period)
+            return (
+                flashes[step_id]
+                + cycles * cycle_flashes
+                + flashes[start + rest]
+                - flashes[start]
+            )
+        seen[digest] = step_id
+        flashes.append(flashes[-1] + data.step())
+    return flashes[-1]
+
+
+def main():
+    fname = "input.txt"
+    # fname = "sample.txt"
+    # fname = "big_data.txt"
+    with get_data(fname) as data:
+        result = process_data(FlatGrid.from_data(data))
+        render_result(result)
+        render_result(total_flashes(FlatGrid.from_data(data), 10**7))
+    # sample -> 195
+    # input -> 265
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from util import NEIGHBOR_OFFSETS_8
+
+from part2 import DataType, get_data, render_result
+
+
+class NumpyGrid:
+    """NumpyGrid steps the whole grid at once with array operations
+
+    Each round of the cascade counts, for every cell, how many of its neighbors
+    just flashed by adding up 8 shifted views of a zero-padded copy of the new flashes.
+    """
+
+    def __init__(self, energy: np.ndarray):
+        self.energy = energy.astype(np.uint8)
+        height, width = energy.shape
+        # Reused every round, the zero border stands in for the cells off the edge
+        self.padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+
+    @classmethod
+    def from_data(cls, data: DataType) -> "NumpyGrid":
+        return cls(np.array([[point.value for point in row] for row in data.data]))
+
+    def step(self) -> int:
+        height, width = self.energy.shape
+        padded = self.padded
+        energy = self.energy + 1
+        flashed = np.zeros(energy.shape, dtype=bool)
+        new_flashes = energy > 9
+
+        while new_flashes.any():
+            flashed |= new_flashes
+            padded[1:-1, 1:-1] = new_flashes
+            for row_step, col_step in NEIGHBOR_OFFSETS_8:
+                # Cell (r, c) hears from (r + row_step, c + col_step)
+                energy += padded[
+                    1 + row_step : 1 + row_step + height,
+                    1 + col_step : 1 + col_step + width,
+                ]
+            new_flashes = (energy > 9) & ~flashed
+
+        energy[flashed] = 0
+        self.energy = energy
+        return int(np.count_nonzero(flashed))
+
+    def __str__(self) -> str:
+        return "\n".join("".join(map(str, row)) for row in self.energy.tolist())
+
+
+def process_data(data: NumpyGrid) -> int:
+    count = 1
+    while data.step() < data.energy.size:
+        count += 1
+    print(data)
+    return count
+
+
+def main():
+    fname = "input.txt"
+    # fname = "sample.txt"
+    # fname = "big_data.txt"
+    with get_data(fname) as data:
+        result = process_data(NumpyGrid.from_data(data))
+        render_result(result)
+    # sample -> 195
+    # input -> 265
+
+
+if __name__ == "__main__":
+    main()
@@ -2,12 +2,13 @@
 
 import os
 from contextlib import contextmanager
+from itertools import islice
 from typing import Counter, Iterable, Iterator
 from util import pairwise
 
 TableType = dict[tuple[str, str], str]
 DataType = tuple[str, TableType]
-ResultType = str
+ResultType = Counter[str]
 
 
 @contextmanager
@@ -40,12 +41,64 @@ def step(pattern: str, table: TableType) -> str:
     return "".join(_step(pattern, table))
 
 
+def _expand_pair(prev: str, cur: str, table: TableType, rounds: int) -> Iterable[str]:
+    """_expand_pair yields the characters that end up between prev and cur, depth first
+
+    Args:
+        prev (str): The left character of the pair
+        cur (str): The right character of the pair
+        table (TableType): The mapping table of character pair to new value
+        rounds (int): The number of rounds of insertion
+
+    Yields:
+        str: The inserted characters in order, excluding prev and cur
+    """
+    # Pending work, either a (prev, cur, rounds) span to expand or a character to yield.
+    # Left spans are expanded first so it never holds more than ~2 entries per round.
+    stack: list[tuple[str, str, int] | str] = [(prev, cur, rounds)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        prev, cur, rounds = item
+        if rounds and (new_value := table.get((prev, cur))) is not None:
+            # E.g (X, Y) -> X Z Y
+            stack.append((new_value, cur, rounds - 1))
+            stack.append(new_value)
+            stack.append((prev, new_value, rounds - 1))
+
+
+def expand(pattern: str, table: TableType, rounds: int) -> Iterable[str]:
+    """expand lazily yields the polymer after the given rounds, one character at a time
+
+    Memory is O(rounds) no matter how long the polymer gets.
+    """
+    for cur, prev in pairwise(pattern):
+        if prev is not None:
+            yield from _expand_pair(prev, cur, table, rounds)
+        yield cur
+
+
+def element_counts(pattern: str, table: TableType, rounds: int) -> Counter[str]:
+    return Counter(expand(pattern, table, rounds))
+
+
+def prefix(pattern: str, table: TableType, rounds: int, length: int) -> str:
+    return "".join(islice(expand(pattern, table, rounds), length))
+
+
+def char_at(pattern: str, table: TableType, rounds: int, index: int) -> str:
+    try:
+        return next(islice(expand(pattern, table, rounds), index, None))
+    except StopIteration:
+        raise IndexError("polymer index out of range") from None
+
+
 def process_data(data: DataType) -> ResultType:
     pattern, table = data
-    result = pattern
-    for _ in range(10):
-        result = step(result, table)
-    return result
+    # Count the elements as they stream by instead of building up the whole string
+    return element_counts(pattern, table, 10)
 
 
 def render_result(result: ResultType):
@@ -53,7 +106,7 @@ def render_result(result: ResultType):
     # print(result)
 
 
-def score(result: str) -> int:
+def score(result: Iterable[str] | Counter[str]) -> int:
     counts = Counter(result)
     first, *_, last = counts.most_common()
 
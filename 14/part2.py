@@ -3,14 +3,16 @@
 import os
 from collections import defaultdict
 from contextlib import contextmanager
+from itertools import product
 from pprint import pprint
-from typing import Counter, Iterator, TypeVar
+from typing import Counter, Iterable, Iterator, NamedTuple, TypeVar
 
 from util import pairwise
 
 T = TypeVar("T")
 
-GenericTable = dict[tuple[str | None, str], T]
+Pair = tuple[str | None, str]
+GenericTable = dict[Pair, T]
 TableType = GenericTable[str]
 PairCounts = GenericTable[int]
 DataType = tuple[str, TableType]
@@ -57,6 +59,82 @@ def step(pattern: PairCounts, table: TableType) -> PairCounts:
     return result
 
 
+class CompiledTable(NamedTuple):
+    """CompiledTable numbers every possible pair so pair counts can live in a flat list"""
+
+    pairs: list[Pair]
+    pair_ids: dict[Pair, int]
+    # left[i] is the id of (prev, new) for pair i, or i itself when pair i has no rule
+    left: list[int]
+    # right[i] is the id of (new, cur) for pair i, or len(pairs) when pair i has no rule
+    # so the extra count lands in a slot that gets thrown away
+    right: list[int]
+
+    def encode(self, pair_counts: PairCounts) -> list[int]:
+        counts = [0] * len(self.pairs)
+        for pair, count in pair_counts.items():
+            counts[self.pair_ids[pair]] += count
+        return counts
+
+    def decode(self, counts: list[int]) -> PairCounts:
+        return {self.pairs[i]: count for i, count in enumerate(counts) if count}
+
+
+def compile_table(table: TableType, elements: Iterable[str] = ()) -> CompiledTable:
+    """compile_table numbers the pairs of the alphabet and resolves each rule to pair ids
+
+    Args:
+        table (TableType): The mapping table of character pair to new value
+        elements (Iterable[str], optional): Extra elements, e.g. from the template, that
+            may not appear in any rule. Defaults to ().
+
+    Returns:
+        CompiledTable: The numbered pairs and their children
+    """
+    alphabet = set(elements) | set(table.values())
+    for pair in table:
+        alphabet.update(pair)
+    ordered = sorted(c for c in alphabet if c is not None)
+
+    # The first character of a pattern is tracked as the pair (None, c)
+    pairs: list[Pair] = [(None, c) for c in ordered]
+    pairs.extend(product(ordered, repeat=2))
+    pair_ids = {pair: i for i, pair in enumerate(pairs)}
+
+    left: list[int] = []
+    right: list[int] = []
+    for i, pair in enumerate(pairs):
+        if pair in table:
+            prev, cur = pair
+            new_value = table[pair]
+            left.append(pair_ids[(prev, new_value)])
+            right.append(pair_ids[(new_value, cur)])
+        else:
+            left.append(i)
+            right.append(len(pairs))
+
+    return CompiledTable(pairs, pair_ids, left, right)
+
+
+def step_dense(counts: list[int], compiled: CompiledTable) -> list[int]:
+    """step_dense performs one round of substitution on flat pair counts
+
+    Args:
+        counts (list[int]): The initial counts of each pair id
+        compiled (CompiledTable): The numbered pairs and their children
+
+    Returns:
+        list[int]: The final counts of each pair id
+    """
+    # One extra slot to catch the right child of pairs without a rule
+    result = [0] * (len(counts) + 1)
+    for count, left, right in zip(counts, compiled.left, compiled.right):
+        result[left] += count
+        result[right] += count
+    result.pop()
+    return result
+
+
 def process_data(data: DataType) -> ResultType:
     """process_data computes the score after 40 rounds of replacement
 
@@ -67,15 +145,16 @@ def process_data(data: DataType) -> ResultType:
         ResultType: The final score
     """
     pattern, table = data
+    compiled = compile_table(table, pattern)
 
     # Build up the initial pair counts from the given pattern
-    result = _pair_counts(pattern)
+    result = compiled.encode(_pair_counts(pattern))
 
     for _ in range(40):
-        result = step(result, table)
+        result = step_dense(result, compiled)
         # pprint(result)
 
-    final_score = score(result)
+    final_score = score(compiled.decode(result))
 
     return final_score
 
@@ -110,7 +189,23 @@ def score(result: PairCounts) -> int:
     Returns:
         int: The score of the result
     """
-    counts: dict[str, int] = Counter()
+    counts = element_counts(result)
+
+    pprint(counts)
+    return _score_counts(counts)
+
+
+def element_counts(result: PairCounts) -> Counter[str]:
+    """element_counts totals the elements of the polymer described by the pair counts
+
+    Args:
+        result (PairCounts): The map of character pairs to their counts, including the
+            (None, c) pair for the first character
+
+    Returns:
+        Counter[str]: The number of each element in the polymer
+    """
+    counts: Counter[str] = Counter()
 
     # Only look at one character of the pair, otherwise we'll double count
     # e.g. ABC -> "AB", "BC" the B is counted twice if we look at every character.
@@ -118,12 +213,113 @@ def score(result: PairCounts) -> int:
     for (_, c2), count in result.items():
         counts[c2] += count
 
-    pprint(counts)
+    return counts
+
+
+def _score_counts(counts: Counter[str]) -> int:
     first, *_, last = counts.most_common()
 
     return first[1] - last[1]
 
 
+class BatchScorer:
+    """BatchScorer scores many templates against one rule table and number of rounds
+
+    Every pair's contribution to the final element counts (the second character of each
+    pair it turns into, same as element_counts) is worked out once up front. A template's
+    element counts are then just its pair counts times those contributions, and the
+    (None, c) pair takes care of the first character exactly like it does in score.
+    """
+
+    def __init__(
+        self, table: TableType, rounds: int = 40, elements: Iterable[str] = ()
+    ):
+        """
+        Args:
+            table (TableType): The mapping table of character pair to new value
+            rounds (int, optional): The number of rounds of replacement. Defaults to 40.
+            elements (Iterable[str], optional): Extra elements the templates may use that
+                don't appear in any rule. Defaults to ().
+        """
+        compiled = compile_table(table, elements)
+        self.compiled = compiled
+        self.elements = [cur for prev, cur in compiled.pairs if prev is None]
+        sink = len(compiled.pairs)
+
+        # contributions[pair_id][element_id] after 0 rounds is just the pair's second character
+        contributions = [
+            [int(cur == element) for element in self.elements]
+            for _, cur in compiled.pairs
+        ]
+        for _ in range(rounds):
+            # (X, Y) contributes whatever (X, Z) and (Z, Y) contribute one round later
+            contributions = [
+                (
+                    contributions[pair_id]
+                    if right == sink
+                    else [
+                        x + y for x, y in zip(contributions[left], contributions[right])
+                    ]
+                )
+                for pair_id, (left, right) in enumerate(
+                    zip(compiled.left, compiled.right)
+                )
+            ]
+        self.contributions = contributions
+
+    def element_counts(self, pattern: str) -> Counter[str]:
+        """element_counts counts every element of the pattern after the rounds
+
+        Args:
+            pattern (str): The polymer template
+
+        Raises:
+            KeyError: If the pattern uses an element that is in neither the rules nor
+                elements, from the compiled.pair_ids lookup
+
+        Returns:
+            Counter[str]: The number of each element in the final polymer
+        """
+        totals = [0] * len(self.elements)
+        for pair, count in _pair_counts(pattern).items():
+            contribution = self.contributions[self.compiled.pair_ids[pair]]
+            for element_id, value in enumerate(contribution):
+                totals[element_id] += count * value
+        return Counter(
+            {element: total for element, total in zip(self.elements, totals) if total}
+        )
+
+    def score(self, pattern: str) -> int:
+        """score is the quantity of the most common element minus the quantity of the least common element.
+
+        Args:
+            pattern (str): The polymer template
+
+        Raises:
+            KeyError: If the pattern uses an element that is in neither the rules nor
+                elements
+
+        Returns:
+            int: The score of the final polymer
+        """
+        return _score_counts(self.element_counts(pattern))
+
+    def score_many(self, patterns: Iterable[str]) -> list[int]:
+        """score_many scores each of the patterns against the shared contributions
+
+        Args:
+            patterns (Iterable[str]): The polymer templates
+
+        Raises:
+            KeyError: If a pattern uses an element that is in neither the rules nor
+                elements
+
+        Returns:
+            list[int]: The score of each template, in order
+        """
+        return [self.score(pattern) for pattern in patterns]
+
+
 def main():
     # fname = "sample.txt"
     # fname = "small_sample.txt"
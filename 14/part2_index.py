@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+
+from bisect import bisect_right
+from typing import Counter
+
+from part2 import (
+    DataType,
+    ResultType,
+    TableType,
+    _score_counts,
+    compile_table,
+    get_data,
+    render_result,
+)
+
+
+def _add(a: list[int], b: list[int]) -> list[int]:
+    return [x + y for x, y in zip(a, b)]
+
+
+class PolymerIndex:
+    """PolymerIndex answers position queries about the polymer without expanding it
+
+    For every pair and depth it stores how many elements end up between the two
+    characters of the pair and how many of each element that is. A query then walks
+    down a single branch of the insertion tree, one level per round.
+    """
+
+    def __init__(self, pattern: str, table: TableType, rounds: int):
+        compiled = compile_table(table, pattern)
+        self.pattern = pattern
+        self.rounds = rounds
+        self.compiled = compiled
+        # The first block of pairs is (None, c) for every element c
+        self.elements = [cur for prev, cur in compiled.pairs if prev is None]
+        self.element_ids = element_ids = {c: i for i, c in enumerate(self.elements)}
+        sink = len(compiled.pairs)
+
+        # inserted_length[depth][pair_id] and inserted_counts[depth][pair_id] describe
+        # the elements between the two characters of the pair after depth rounds
+        empty = [0] * len(self.elements)
+        self.inserted_length = [[0] * len(compiled.pairs)]
+        self.inserted_counts = [[empty] * len(compiled.pairs)]
+        for _ in range(rounds):
+            lengths = self.inserted_length[-1]
+            counts = self.inserted_counts[-1]
+            new_lengths: list[int] = []
+            new_counts: list[list[int]] = []
+            for pair_id, (left, right) in enumerate(zip(compiled.left, compiled.right)):
+                if right == sink:
+                    # No rule, nothing ever gets inserted
+                    new_lengths.append(0)
+                    new_counts.append(empty)
+                    continue
+                new_value = compiled.pairs[left][1]
+                new_lengths.append(lengths[left] + 1 + lengths[right])
+                pair_counts = _add(counts[left], counts[right])
+                pair_counts[element_ids[new_value]] += 1
+                new_counts.append(pair_counts)
+            self.inserted_length.append(new_lengths)
+            self.inserted_counts.append(new_counts)
+
+        # offsets[i] is where pattern[i] lands in the final polymer, and
+        # offset_counts[i] the element counts of everything before it
+        self.pair_ids = [compiled.pair_ids[pair] for pair in zip(pattern, pattern[1:])]
+        self.offsets = [0]
+        self.offset_counts = [empty]
+        for i, pair_id in enumerate(self.pair_ids):
+            before = list(self.offset_counts[-1])
+            before[element_ids[pattern[i]]] += 1
+            self.offsets.append(
+                self.offsets[-1] + 1 + self.inserted_length[rounds][pair_id]
+            )
+            self.offset_counts.append(
+                _add(before, self.inserted_counts[rounds][pair_id])
+            )
+        self.length = self.offsets[-1] + 1
+
+    def __len__(self) -> int:
+        return self.length
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """_locate finds the template character at or before index and the distance past it"""
+        if not 0 <= index < self.length:
+            raise IndexError("polymer index out of range")
+        i = bisect_right(self.offsets, index) - 1
+        return i, index - self.offsets[i]
+
+    def __getitem__(self, index: int) -> str:
+        """The element at index of the final polymer, in O(rounds)"""
+        i, offset = self._locate(index)
+        if offset == 0:
+            return self.pattern[i]
+        # Skip over pattern[i] itself
+        offset -= 1
+        compiled = self.compiled
+        pair_id = self.pair_ids[i]
+        for depth in range(self.rounds, 0, -1):
+            left = compiled.left[pair_id]
+            left_length = self.inserted_length[depth - 1][left]
+            if offset < left_length:
+                pair_id = left
+            elif offset == left_length:
+                return compiled.pairs[left][1]
+            else:
+                offset -= left_length + 1
+                pair_id = compiled.right[pair_id]
+        raise AssertionError("offset ran past the inserted elements")
+
+    def _counts_before(self, index: int) -> list[int]:
+        """_counts_before counts the elements of the final polymer before index"""
+        if index == self.length:
+            return _add(
+                self.offset_counts[-1],
+                [int(c == self.pattern[-1]) for c in self.elements],
+            )
+        i, offset = self._locate(index)
+        result = list(self.offset_counts[i])
+        if offset == 0:
+            return result
+        result[self.element_ids[self.pattern[i]]] += 1
+        offset -= 1
+        compiled = self.compiled
+        pair_id = self.pair_ids[i]
+        for depth in range(self.rounds, 0, -1):
+            if offset == 0:
+                break
+            left = compiled.left[pair_id]
+            left_length = self.inserted_length[depth - 1][left]
+            if offset <= left_length:
+                pair_id = left
+            else:
+                # The whole left branch and the inserted element come before index
+                result = _add(result, self.inserted_counts[depth - 1][left])
+                result[self.element_ids[compiled.pairs[left][1]]] += 1
+                offset -= left_length + 1
+                pair_id = compiled.right[pair_id]
+        return result
+
+    def element_counts(self, start: int = 0, stop: int | None = None) -> Counter[str]:
+        """element_counts counts the elements in polymer[start:stop], in O(rounds)
+
+        Args:
+            start (int, optional): The first index to include. Defaults to 0.
+            stop (int | None, optional): The index to stop before. Defaults to the end.
+
+        Returns:
+            Counter[str]: The number of each element in the range
+        """
+        if stop is None:
+            stop = self.length
+        if not 0 <= start <= stop <= self.length:
+            raise IndexError("polymer range out of range")
+        counts = _add(
+            self._counts_before(stop), [-x for x in self._counts_before(start)]
+        )
+        return Counter({c: count for c, count in zip(self.elements, counts) if count})
+
+
+def process_data(data: DataType, rounds: int = 40) -> ResultType:
+    pattern, table = data
+    index = PolymerIndex(pattern, table, rounds)
+    return _score_counts(index.element_counts())
+
+
+def main():
+    # fname = "sample.txt"
+    # fname = "small_sample.txt"
+    fname = "input.txt"
+    # fname = "big_data.txt"
+    with get_data(fname) as data:
+        result = process_data(data)
+        render_result(result)
+    # sample -> 2188189693529
+    # small_sample -> 732700749385
+    # input -> 2911561572630
+
+
+if __name__ == "__main__":
+    main()
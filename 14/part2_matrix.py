@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+from part2 import (
+    CompiledTable,
+    DataType,
+    ResultType,
+    _pair_counts,
+    compile_table,
+    get_data,
+    render_result,
+    score,
+)
+
+# SparseMatrix[i][j] is how many of pair j one pair i becomes, zero entries are left out
+SparseMatrix = list[dict[int, int]]
+
+
+def transition_matrix(compiled: CompiledTable) -> SparseMatrix:
+    """transition_matrix expresses one round of insertions as a sparse matrix
+
+    Args:
+        compiled (CompiledTable): The numbered pairs and their children
+
+    Returns:
+        SparseMatrix: The pairs each pair turns into after one round
+    """
+    sink = len(compiled.pairs)
+    matrix: SparseMatrix = []
+    for left, right in zip(compiled.left, compiled.right):
+        row = {left: 1}
+        if right != sink:
+            # E.g. (X, X) -> (X, X) and (X, X) when X is inserted
+            row[right] = row.get(right, 0) + 1
+        matrix.append(row)
+    return matrix
+
+
+def _matrix_multiply(a: SparseMatrix, b: SparseMatrix) -> SparseMatrix:
+    """_matrix_multiply computes a @ b, skipping the zero entries"""
+    result: SparseMatrix = []
+    for a_row in a:
+        row: dict[int, int] = {}
+        for k, a_value in a_row.items():
+            for j, b_value in b[k].items():
+                row[j] = row.get(j, 0) + a_value * b_value
+        result.append(row)
+    return result
+
+
+def _vector_multiply(counts: list[int], matrix: SparseMatrix) -> list[int]:
+    """_vector_multiply computes counts @ matrix for the row vector counts"""
+    result = [0] * len(counts)
+    for i, count in enumerate(counts):
+        if count:
+            for j, value in matrix[i].items():
+                result[j] += count * value
+    return result
+
+
+def apply_power(counts: list[int], matrix: SparseMatrix, exponent: int) -> list[int]:
+    """apply_power computes counts @ matrix ** exponent by repeated squaring
+
+    Only the squarings are matrix products, each set bit of exponent is applied to the
+    counts directly as a cheaper vector product.
+
+    Args:
+        counts (list[int]): The row vector of pair counts
+        matrix (SparseMatrix): The square matrix to raise
+        exponent (int): The non-negative power
+
+    Returns:
+        list[int]: The pair counts after exponent applications of matrix
+    """
+    while exponent:
+        if exponent & 1:
+            # Powers of the same matrix commute, so the order doesn't matter
+            counts = _vector_multiply(counts, matrix)
+        exponent >>= 1
+        if exponent:
+            matrix = _matrix_multiply(matrix, matrix)
+    return counts
+
+
+def process_data(data: DataType, rounds: int = 40) -> ResultType:
+    """process_data computes the score after the given rounds of replacement
+
+    Args:
+        data (DataType): The pattern and replacement table
+        rounds (int, optional): The number of rounds. Defaults to 40.
+
+    Returns:
+        ResultType: The final score
+    """
+    pattern, table = data
+    compiled = compile_table(table, pattern)
+
+    counts = compiled.encode(_pair_counts(pattern))
+    # Applying the transition rounds times is the same as applying its rounds-th power once
+    counts = apply_power(counts, transition_matrix(compiled), rounds)
+
+    return score(compiled.decode(counts))
+
+
+def main():
+    # fname = "sample.txt"
+    # fname = "small_sample.txt"
+    fname = "input.txt"
+    # fname = "big_data.txt"
+    with get_data(fname) as data:
+        result = process_data(data)
+        render_result(result)
+    # sample -> 2188189693529
+    # small_sample -> 732700749385
+    # input -> 2911561572630
+
+
+if __name__ == "__main__":
+    main()
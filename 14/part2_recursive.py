@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+from typing import Counter
+
+from part2 import (
+    DataType,
+    Pair,
+    ResultType,
+    TableType,
+    _score_counts,
+    get_data,
+    render_result,
+)
+
+
+class ElementCounter:
+    """ElementCounter counts polymer elements recursively with a memo table per rule table
+
+    The memo table is keyed on (pair, depth) only, so every template run against the
+    same rules shares the subproblems already solved for earlier templates.
+    """
+
+    def __init__(self, table: TableType):
+        self.table = table
+        # A plain dict rather than functools.cache on a bound method, which would
+        # reference the instance and keep it alive until the cyclic collector runs
+        self._memo: dict[tuple[Pair, int], Counter[str]] = {}
+
+    def inserted(self, pair: Pair, depth: int) -> Counter[str]:
+        """inserted counts the elements that end up between the two characters of pair
+
+        Args:
+            pair (Pair): The adjacent characters
+            depth (int): The number of rounds of insertion
+
+        Returns:
+            Counter[str]: A copy of the elements inserted between them, excluding the
+                pair itself, so callers are free to modify it
+        """
+        return Counter(self._inserted(pair, depth))
+
+    def _inserted(self, pair: Pair, depth: int) -> Counter[str]:
+        """_inserted is inserted without the copy, the result is shared with the memo table"""
+        key = (pair, depth)
+        if key in self._memo:
+            return self._memo[key]
+        if depth == 0 or pair not in self.table:
+            result: Counter[str] = Counter()
+        else:
+            prev, cur = pair
+            new_value = self.table[pair]
+            # E.g (X, Y) -> X Z Y, then recurse into (X, Z) and (Z, Y)
+            result = Counter(new_value)
+            result.update(self._inserted((prev, new_value), depth - 1))
+            result.update(self._inserted((new_value, cur), depth - 1))
+        self._memo[key] = result
+        return result
+
+    def element_counts(self, pattern: str, depth: int) -> Counter[str]:
+        """element_counts counts every element of the pattern after depth rounds
+
+        Args:
+            pattern (str): The polymer template
+            depth (int): The number of rounds of insertion
+
+        Returns:
+            Counter[str]: The number of each element in the final polymer
+        """
+        result = Counter(pattern)
+        for pair in zip(pattern, pattern[1:]):
+            result.update(self._inserted(pair, depth))
+        return result
+
+
+def process_data(data: DataType, rounds: int = 40) -> ResultType:
+    pattern, table = data
+    return _score_counts(ElementCounter(table).element_counts(pattern, rounds))
+
+
+def main():
+    # fname = "sample.txt"
+    # fname = "small_sample.txt"
+    fname = "input.txt"
+    # fname = "big_data.txt"
+    with get_data(fname) as data:
+        result = process_data(data)
+        render_result(result)
+    # sample -> 2188189693529
+    # small_sample -> 732700749385
+    # input -> 2911561572630
+
+
+if __name__ == "__main__":
+    main()
@@ -1,137 +1,381 @@
 #!/usr/bin/env python
 
 import os
-from collections import deque
+import sys
+from array import array
 from contextlib import contextmanager
 from dataclasses import dataclass
-from util import PriorityQueue
+from enum import auto
+from functools import cached_property
+from util import BucketQueue, IndexedPriorityQueue, StrEnum
 
 # from io import TextIOWrapper
-from typing import Iterable, Iterator, NamedTuple, Set
-
-
-class DataPoint(NamedTuple):
-    value: int
-    row_id: int
-    col_id: int
-
-    # def __hash__(self) -> int:
-    #     return hash((self.row_id, self.col_id))
-
-
-Grid = list[list[DataPoint]]
+from typing import Iterable, Iterator, NamedTuple
+
+import numpy as np
+
+# Distance of a node the walk hasn't reached yet
+UNREACHED = sys.maxsize
+# Risk levels wrap around to 1 after 9
+MIN_RISK = 1
+MAX_RISK = 9
+
+
+class Engine(StrEnum):
+    DIJKSTRA = auto()
+    DIAL = auto()
+    ASTAR = auto()
+    BIDIRECTIONAL = auto()
+
+
+class SearchResult(NamedTuple):
+    distance: int
+    # Number of nodes popped off the queue and relaxed
+    expansions: int
+
+
+class DistanceField(NamedTuple):
+    # Lowest total risk from the source to each node, indexed by row_id * width + col_id
+    distance: np.ndarray
+    # The node each node is entered from on its best path, -1 for the source
+    predecessor: np.ndarray
+
+    def path(self, target: int) -> list[int]:
+        """path reconstructs the best path from the source to target
+
+        Args:
+            target (int): The index of the node to reach
+
+        Returns:
+            list[int]: The node indexes from the source to target, inclusive
+        """
+        result = [target]
+        while (node := self.predecessor[result[-1]]) >= 0:
+            result.append(int(node))
+        result.reverse()
+        return result
+
+
+def tile(base: np.ndarray, tile_factor: int) -> np.ndarray:
+    """tile expands the base risk map into the full tile_factor x tile_factor map
+
+    Each tile to the right or downward adds 1 to the risk of the tile it was copied from,
+    wrapping risk levels above 9 back around to 1.
+
+    Args:
+        base (np.ndarray): The (rows, cols) risk levels of the scanned tile
+        tile_factor (int): The number of copies of the base tile in each direction
+
+    Returns:
+        np.ndarray: The contiguous (rows * tile_factor, cols * tile_factor) uint8 risk map
+    """
+    rows, cols = base.shape
+    tile_ids = np.arange(tile_factor)
+    # scale[tile_row, tile_col] is how much gets added to every cell in that tile, reduced
+    # mod 9 up front so every cell stays at most 9 + 8 and the sums fit in uint8
+    scale = (np.add.outer(tile_ids, tile_ids) % MAX_RISK).astype(np.uint8)
+    # Laid out as (tile_row, row, tile_col, col) so the reshape puts the tiles in place
+    tiled = np.empty((tile_factor, rows, tile_factor, cols), dtype=np.uint8)
+    np.add(
+        base.astype(np.uint8, copy=False)[np.newaxis, :, np.newaxis, :],
+        scale[:, np.newaxis, :, np.newaxis],
+        out=tiled,
+    )
+    # (risk - 1) % 9 + 1 in place, so the only full-size array is the result itself
+    np.subtract(tiled, 1, out=tiled)
+    np.remainder(tiled, MAX_RISK, out=tiled)
+    np.add(tiled, 1, out=tiled)
+    return tiled.reshape(rows * tile_factor, cols * tile_factor)
+
+
+class TiledRisk:
+    """TiledRisk is a flat view of the tiled risk map that computes each cell on lookup
+
+    Only the base tile is stored, so memory stays proportional to the scan no matter
+    how large the tile factor is.
+    """
+
+    def __init__(self, base: np.ndarray, tile_factor: int):
+        self.base_height, self.base_width = base.shape
+        # Indexing bytes gives plain ints
+        self.base = base.tobytes()
+        self.height = self.base_height * tile_factor
+        self.width = self.base_width * tile_factor
+
+    def __len__(self) -> int:
+        return self.height * self.width
+
+    def __getitem__(self, index: int) -> int:
+        row_id, col_id = divmod(index, self.width)
+        if not 0 <= row_id < self.height:
+            raise IndexError("tiled risk index out of range")
+        tile_row, base_row = divmod(row_id, self.base_height)
+        tile_col, base_col = divmod(col_id, self.base_width)
+        value = self.base[base_row * self.base_width + base_col] + tile_row + tile_col
+        return (value - 1) % MAX_RISK + 1
 
 
 @dataclass
 class DataType:
-    data: Grid
-
-    @property
-    def size(self) -> int:
-        return len(self.data) * 5
-
-    def __getitem__(self, row_col: tuple[int, int]) -> DataPoint:
-        # Fake the giant grid by scaling up on lookups
-        row_id, col_id = row_col
-        scaled_row = row_id % len(self.data)
-        scaled_col = col_id % len(self.data)
-        base_point = self.data[scaled_row][scaled_col]
-
-        scale = (row_id // len(self.data)) + (col_id // len(self.data))
-
-        if not scale:
-            return base_point
-
-        new_value = base_point.value + scale
-        if new_value > 9:
-            new_value = new_value - 9
+    data: np.ndarray
+    tile_factor: int = 5
+    # Compute risk levels on lookup instead of materializing the tiled map
+    lazy: bool = False
 
-        return DataPoint(new_value, row_id, col_id)
+    @cached_property
+    def tiled(self) -> np.ndarray:
+        # Build the giant grid once up front
+        return tile(self.data, self.tile_factor)
 
-    def neighbors(self, p: DataPoint) -> Iterable[DataPoint]:
-        if p.col_id > 0:
-            yield self[p.row_id, p.col_id - 1]
-
-        if p.col_id + 1 < self.size:
-            yield self[p.row_id, p.col_id + 1]
-
-        if p.row_id > 0:
-            yield self[p.row_id - 1, p.col_id]
-
-        if p.row_id + 1 < self.size:
-            yield self[p.row_id + 1, p.col_id]
+    @property
+    def height(self) -> int:
+        return self.data.shape[0] * self.tile_factor
 
-    def walk(self) -> int:
-        """Dijkstra's algorithm"""
-        initial_node = self[0, 0]
-        # Track the DataPoints we've already processed
-        visited: set[DataPoint] = set()
-        # Track the shortest distances from the initial_node to a DataPoint
-        distance: dict[DataPoint, int] = {initial_node: 0}
-        # Track the DataPoints with the shortest distance
-        pq = PriorityQueue[DataPoint]()
+    @property
+    def width(self) -> int:
+        return self.data.shape[1] * self.tile_factor
+
+    @cached_property
+    def risk(self) -> memoryview | TiledRisk:
+        """The tiled risk map flattened so a cell is addressed by row_id * width + col_id"""
+        if self.lazy:
+            return TiledRisk(self.data, self.tile_factor)
+        # Index the materialized map through a memoryview so lookups return plain ints
+        return memoryview(self.tiled.reshape(-1))
+
+    def neighbors(self, index: int) -> Iterable[int]:
+        width = self.width
+        row_id, col_id = divmod(index, width)
+        if col_id > 0:
+            yield index - 1
+
+        if col_id + 1 < width:
+            yield index + 1
+
+        if row_id > 0:
+            yield index - width
+
+        if row_id + 1 < self.height:
+            yield index + width
+
+    def heuristic(self, index: int) -> int:
+        """Lower bound on the risk from index to the bottom right corner
+
+        Every step costs at least MIN_RISK, so the Manhattan distance never overestimates.
+        """
+        row_id, col_id = divmod(index, self.width)
+        return (self.height - 1 - row_id + self.width - 1 - col_id) * MIN_RISK
+
+    def walk(self, engine: Engine = Engine.DIJKSTRA) -> int:
+        return self.search(engine).distance
+
+    def search(self, engine: Engine = Engine.DIJKSTRA) -> SearchResult:
+        """Dijkstra's algorithm
+
+        The engine picks the priority queue: a binary heap for plain Dijkstra, or a ring of
+        buckets for Dial's algorithm, which works because every edge costs 1-9.
+        A* uses the binary heap ordered by distance plus the heuristic.
+        """
+        if engine == Engine.BIDIRECTIONAL:
+            return self._bidirectional_search()
+
+        risk = self.risk
+        node_count = len(risk)
+        initial_node = 0
+        target_node = node_count - 1
+        # Track the nodes we've already processed
+        visited = bytearray(node_count)
+        # Track the shortest distances from the initial_node to a node
+        distance = array("q", [UNREACHED]) * node_count
+        distance[initial_node] = 0
+        # Track the nodes with the shortest distance
+        pq: IndexedPriorityQueue | BucketQueue
+        if engine == Engine.DIAL:
+            # Queued distances are never more than MAX_RISK past the current one
+            pq = BucketQueue(MAX_RISK)
+        else:
+            pq = IndexedPriorityQueue(node_count)
+        use_heuristic = engine == Engine.ASTAR
         # Bootstrap the queue with our initial_node
         pq.add_task(initial_node, distance[initial_node])
+        expansions = 0
 
         while True:
             current_node = pq.pop_task()
-            # print(current_node)
+            if visited[current_node]:
+                # Stale copy left behind in a BucketQueue when the distance was lowered
+                continue
             current_distance = distance[current_node]
 
-            if current_node.row_id == current_node.col_id == self.size - 1:
-                return current_distance
+            if current_node == target_node:
+                return SearchResult(current_distance, expansions)
 
+            visited[current_node] = 1
+            expansions += 1
             for neighbor in self.neighbors(current_node):
-                if neighbor not in visited:
-                    try:
-                        if distance[neighbor] < current_distance + neighbor.value:
-                            # New path to neighbor is longer than the existing path
-                            continue
-                    except KeyError:
-                        # neighbor never visited
-                        pass
-
-                    # current_node is closer or first visit
-                    # Upsert the neighbor distance in the priority queue
-                    try:
-                        pq.remove_task(neighbor)
-                    except KeyError:
-                        # neighbor not in queue yet
-                        pass
-                    new_distance = current_distance + neighbor.value
-                    distance[neighbor] = new_distance
+                if visited[neighbor]:
+                    continue
+
+                new_distance = current_distance + risk[neighbor]
+                if distance[neighbor] <= new_distance:
+                    # New path to neighbor is no shorter than the existing path
+                    continue
+
+                # current_node is closer or first visit
+                # Upsert the neighbor distance in the priority queue
+                distance[neighbor] = new_distance
+                if use_heuristic:
+                    # The heuristic is consistent, so a node is final the first time it's popped
+                    pq.add_task(neighbor, new_distance + self.heuristic(neighbor))
+                else:
                     pq.add_task(neighbor, new_distance)
 
-            visited.add(current_node)
+    def _bidirectional_search(self) -> SearchResult:
+        """Bidirectional Dijkstra's algorithm
+
+        The forward search tracks the risk of getting from the top left corner to a node,
+        which includes the node's own risk. The backward search tracks the risk still to be
+        entered on the way from a node to the bottom right corner, which excludes it.
+        That way the best path through a node costs forward + backward at that node.
+        """
+        risk = self.risk
+        node_count = len(risk)
+        initial_node = 0
+        target_node = node_count - 1
+        forward, backward = 0, 1
+        sources = (initial_node, target_node)
+        visited = (bytearray(node_count), bytearray(node_count))
+        distance = (
+            array("q", [UNREACHED]) * node_count,
+            array("q", [UNREACHED]) * node_count,
+        )
+        queues = (IndexedPriorityQueue(node_count), IndexedPriorityQueue(node_count))
+        for side in (forward, backward):
+            distance[side][sources[side]] = 0
+            queues[side].add_task(sources[side], 0)
+        # Shortest complete path seen so far
+        best = 0 if initial_node == target_node else UNREACHED
+        expansions = 0
+
+        while queues[forward] and queues[backward]:
+            forward_top = queues[forward].peek_priority()
+            backward_top = queues[backward].peek_priority()
+            if forward_top + backward_top >= best:
+                # No unexpanded node can sit on a path shorter than best
+                break
+
+            # Grow whichever frontier is closer to its source
+            side = forward if forward_top <= backward_top else backward
+            side_visited = visited[side]
+            side_distance = distance[side]
+            other_distance = distance[1 - side]
+            pq = queues[side]
+
+            current_node = pq.pop_task()
+            current_distance = side_distance[current_node]
+            side_visited[current_node] = 1
+            expansions += 1
+            for neighbor in self.neighbors(current_node):
+                if side_visited[neighbor]:
+                    continue
+
+                # Moving between two cells costs the risk of the cell being entered
+                if side == forward:
+                    new_distance = current_distance + risk[neighbor]
+                else:
+                    new_distance = current_distance + risk[current_node]
+                if side_distance[neighbor] <= new_distance:
+                    continue
+
+                side_distance[neighbor] = new_distance
+                pq.add_task(neighbor, new_distance)
+                if other_distance[neighbor] != UNREACHED:
+                    best = min(best, new_distance + other_distance[neighbor])
+
+        return SearchResult(best, expansions)
+
+    def distance_field(self, source: int = 0) -> DistanceField:
+        """Dijkstra's algorithm (with Dial's bucket queue) run to every node in one pass
+
+        Args:
+            source (int, optional): The index of the starting node. Defaults to 0.
+
+        Returns:
+            DistanceField: The distance to and predecessor of every node
+        """
+        risk = self.risk
+        node_count = len(risk)
+        visited = bytearray(node_count)
+        distance = array("q", [UNREACHED]) * node_count
+        predecessor = array("q", [-1]) * node_count
+        distance[source] = 0
+        pq = BucketQueue(MAX_RISK)
+        pq.add_task(source, 0)
+
+        while pq:
+            current_node = pq.pop_task()
+            if visited[current_node]:
+                # Stale copy left behind when the distance was lowered
+                continue
+            visited[current_node] = 1
+            current_distance = distance[current_node]
+            for neighbor in self.neighbors(current_node):
+                if visited[neighbor]:
+                    continue
+                new_distance = current_distance + risk[neighbor]
+                if distance[neighbor] <= new_distance:
+                    continue
+                distance[neighbor] = new_distance
+                predecessor[neighbor] = current_node
+                pq.add_task(neighbor, new_distance)
+
+        # Wrap the arrays without copying them
+        return DistanceField(
+            distance=np.frombuffer(distance, dtype=np.int64),
+            predecessor=np.frombuffer(predecessor, dtype=np.int64),
+        )
+
+    def render_path(self, path: Iterable[int]) -> str:
+        """render_path draws the tiled map with every cell off the path blanked out"""
+        on_path = set(path)
+        risk = self.risk
+        return "\n".join(
+            "".join(
+                str(risk[index]) if index in on_path else "."
+                for index in range(row_id * self.width, (row_id + 1) * self.width)
+            )
+            for row_id in range(self.height)
+        )
 
     def __str__(self) -> str:
-        return "\n".join("".join(str(p.value) for p in row) for row in self.data)
+        return "\n".join("".join(map(str, row)) for row in self.data.tolist())
 
 
 ResultType = int
 
 
 @contextmanager
-def get_data(fname: str) -> Iterator[DataType]:
+def get_data(
+    fname: str, tile_factor: int = 5, lazy: bool = False
+) -> Iterator[DataType]:
     dir_path = os.path.dirname(os.path.realpath(__file__))
     fpath = os.path.join(dir_path, fname)
-    with open(fpath) as raw_data:
-        result = [
+    with open(fpath, "rb") as raw_data:
+        # Each line is a row of ASCII digits, so the risk level is the byte minus b"0"
+        result = np.array(
             [
-                DataPoint(
-                    value=int(c),
-                    row_id=row_id,
-                    col_id=col_id,
-                )
-                for col_id, c in enumerate(line.strip())
-            ]
-            for row_id, line in enumerate(raw_data)
-        ]
-        yield DataType(data=result)
-
-
-def process_data(data: DataType) -> ResultType:
-    return data.walk()
+                np.frombuffer(line.strip(), dtype=np.uint8)
+                for line in raw_data
+                if line.strip()
+            ],
+            dtype=np.uint8,
+        )
+        result -= ord("0")
+        yield DataType(data=result, tile_factor=tile_factor, lazy=lazy)
+
+
+def process_data(data: DataType, engine: Engine = Engine.DIJKSTRA) -> ResultType:
+    return data.walk(engine)
 
 
 def render_result(result: ResultType):
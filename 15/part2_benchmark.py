@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+from time import perf_counter
+
+import numpy as np
+
+from part2 import DataType, Engine, get_data
+
+
+def random_data(rows: int, cols: int, tile_factor: int = 5, seed: int = 0) -> DataType:
+    """random_data builds a synthetic scan with risk levels 1-9
+
+    Args:
+        rows (int): The number of rows in the base tile
+        cols (int): The number of columns in the base tile
+        tile_factor (int, optional): The number of copies of the base tile in each direction. Defaults to 5.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        DataType: The synthetic scan
+    """
+    rng = np.random.default_rng(seed)
+    return DataType(
+        data=rng.integers(1, 10, size=(rows, cols), dtype=np.uint8),
+        tile_factor=tile_factor,
+    )
+
+
+def benchmark(name: str, data: DataType) -> None:
+    # Build the risk map before timing so every engine starts from the same state
+    data.risk
+    for engine in Engine:
+        start = perf_counter()
+        distance, expansions = data.search(engine)
+        elapsed = perf_counter() - start
+        print(f"{name} engine={engine.value} {distance=} {expansions=} {elapsed=:.3f}s")
+
+
+def main():
+    for tile_factor in (5, 10):
+        with get_data("input.txt", tile_factor=tile_factor) as data:
+            benchmark(f"input_x{tile_factor}", data)
+    with get_data("input.txt", lazy=True) as data:
+        benchmark("input_x5_lazy", data)
+    benchmark("random_200x200", random_data(200, 200))
+
+
+if __name__ == "__main__":
+    main()
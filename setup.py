@@ -3,4 +3,5 @@ from setuptools import setup, find_packages
 setup(
     name="advent2021",
     packages=find_packages(),
+    install_requires=["numpy"],
 )
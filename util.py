@@ -1,7 +1,8 @@
+from array import array
 from enum import Enum
 from itertools import tee, count
 from typing import Generic, Iterable, Literal, TypeVar
-from heapq import heappop, heappush
+from heapq import heapify, heappop, heappush
 from dataclasses import dataclass
 
 
@@ -31,6 +32,59 @@ def pairwise(data: Iterable[T]) -> Iterable[tuple[T, T | None]]:
     yield from zip(a, b)
 
 
+# (row, col) steps to the 8 cells around a cell
+NEIGHBOR_OFFSETS_8 = tuple(
+    (row_step, col_step)
+    for row_step in range(-1, 2)
+    for col_step in range(-1, 2)
+    if row_step or col_step
+)
+
+
+# Fills the neighbor_table slots that would fall off the edge of the grid
+NO_NEIGHBOR = -1
+
+
+def neighbor_table(
+    height: int, width: int, offsets: Iterable[tuple[int, int]] = NEIGHBOR_OFFSETS_8
+) -> array:
+    """neighbor_table precomputes the neighbors of every cell of a height x width grid
+
+    Cells are addressed by flat index row_id * width + col_id. The table is one flat
+    array with a slot per offset for every cell, so the neighbors of cell i are
+    table[i * len(offsets) : (i + 1) * len(offsets)] in offset order, with NO_NEIGHBOR
+    in the slots that fall off the grid.
+
+    Args:
+        height (int): The number of rows
+        width (int): The number of columns
+        offsets (Iterable[tuple[int, int]], optional): The (row, col) steps to a neighbor.
+            Defaults to NEIGHBOR_OFFSETS_8.
+
+    Returns:
+        array: The flat indexes of the neighbors of each flat index
+    """
+    offsets = tuple(offsets)
+    stride = len(offsets)
+    table = array("l", [NO_NEIGHBOR]) * (height * width * stride)
+    # Slicing this copies runs of neighbor indexes without a Python level loop per cell
+    indexes = array("l", range(height * width))
+    for slot, (row_step, col_step) in enumerate(offsets):
+        # Only the columns whose neighbor stays on the grid get filled in
+        first_col = max(0, -col_step)
+        stop_col = min(width, width - col_step)
+        if first_col >= stop_col:
+            continue
+        delta = row_step * width + col_step
+        for row_id in range(max(0, -row_step), min(height, height - row_step)):
+            first = row_id * width + first_col
+            stop = row_id * width + stop_col
+            table[first * stride + slot : stop * stride : stride] = indexes[
+                first + delta : stop + delta
+            ]
+    return table
+
+
 # https://docs.python.org/3/library/heapq.html
 RemovedTask = Literal["<removed-task>"]
 REMOVED_TASK: RemovedTask = "<removed-task>"
@@ -48,6 +102,8 @@ class PriorityQueue(Generic[T]):
         self.pq: list[PriorityQueueEntry[T]] = []
         self.entry_finder: dict[T, PriorityQueueEntry[T]] = {}
         self.counter = count()
+        # Number of tombstoned entries still sitting in self.pq
+        self.removed = 0
 
     def add_task(self, task: T, priority: int = 0) -> None:
         if task in self.entry_finder:
@@ -58,13 +114,173 @@ class PriorityQueue(Generic[T]):
         heappush(self.pq, entry)
 
     def remove_task(self, task: T) -> None:
-        entry = self.entry_finder[task]
+        entry = self.entry_finder.pop(task)
         entry.task = REMOVED_TASK
+        self.removed += 1
+        self._maybe_compact()
 
     def pop_task(self) -> T:
         while self.pq:
             entry = heappop(self.pq)
             if entry.task != REMOVED_TASK:
                 del self.entry_finder[entry.task]
+                # Popping live entries can leave the tombstones in the majority too
+                self._maybe_compact()
                 return entry.task
+            self.removed -= 1
         raise KeyError("pop_task from an empty priority queue")
+
+    def _maybe_compact(self) -> None:
+        # Drop the tombstones once they outnumber the live entries
+        if self.removed > len(self.pq) // 2:
+            self._compact()
+
+    def _compact(self) -> None:
+        self.pq = [entry for entry in self.pq if entry.task != REMOVED_TASK]
+        heapify(self.pq)
+        self.removed = 0
+
+
+class IndexedPriorityQueue:
+    """IndexedPriorityQueue is a binary min-heap of integer tasks in range(capacity)
+
+    The heap is stored as two parallel arrays of tasks and priorities, and
+    position[task] tracks where each task sits in the heap (-1 when it isn't queued).
+    Re-adding a queued task moves it in place (decrease-key) instead of leaving a
+    tombstone behind, so the heap never holds more than one entry per task.
+    """
+
+    def __init__(self, capacity: int):
+        self.tasks: list[int] = []
+        self.priorities: list[int] = []
+        self.position = array("q", [-1]) * capacity
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __contains__(self, task: int) -> bool:
+        return self.position[task] >= 0
+
+    def add_task(self, task: int, priority: int = 0) -> None:
+        index = self.position[task]
+        if index < 0:
+            index = len(self.tasks)
+            self.tasks.append(task)
+            self.priorities.append(priority)
+            self.position[task] = index
+            self._sift_up(index)
+        elif priority < self.priorities[index]:
+            self.priorities[index] = priority
+            self._sift_up(index)
+        else:
+            self.priorities[index] = priority
+            self._sift_down(index)
+
+    def peek_priority(self) -> int:
+        if not self.priorities:
+            raise KeyError("peek_priority from an empty priority queue")
+        return self.priorities[0]
+
+    def remove_task(self, task: int) -> None:
+        index = self.position[task]
+        if index < 0:
+            raise KeyError(task)
+        self._delete(index)
+
+    def pop_task(self) -> int:
+        if not self.tasks:
+            raise KeyError("pop_task from an empty priority queue")
+        task = self.tasks[0]
+        self._delete(0)
+        return task
+
+    def _delete(self, index: int) -> None:
+        tasks = self.tasks
+        priorities = self.priorities
+        self.position[tasks[index]] = -1
+        last_task = tasks.pop()
+        last_priority = priorities.pop()
+        if index == len(tasks):
+            return
+        # Move the last entry into the hole and restore the heap invariant
+        tasks[index] = last_task
+        priorities[index] = last_priority
+        self.position[last_task] = index
+        self._sift_down(index)
+        self._sift_up(self.position[last_task])
+
+    def _sift_up(self, index: int) -> None:
+        tasks = self.tasks
+        priorities = self.priorities
+        position = self.position
+        task = tasks[index]
+        priority = priorities[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            # Shift the parent down into the hole
+            tasks[index] = tasks[parent]
+            priorities[index] = priorities[parent]
+            position[tasks[index]] = index
+            index = parent
+        tasks[index] = task
+        priorities[index] = priority
+        position[task] = index
+
+    def _sift_down(self, index: int) -> None:
+        tasks = self.tasks
+        priorities = self.priorities
+        position = self.position
+        size = len(tasks)
+        task = tasks[index]
+        priority = priorities[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            # Pick the smaller of the two children
+            if child + 1 < size and priorities[child + 1] < priorities[child]:
+                child += 1
+            if priority <= priorities[child]:
+                break
+            # Shift the child up into the hole
+            tasks[index] = tasks[child]
+            priorities[index] = priorities[child]
+            position[tasks[index]] = index
+            index = child
+        tasks[index] = task
+        priorities[index] = priority
+        position[task] = index
+
+
+class BucketQueue:
+    """BucketQueue is a monotone priority queue for small integer priorities (Dial's algorithm)
+
+    Every queued priority must be within max_priority_step of the last popped priority,
+    so max_priority_step + 1 buckets used as a ring (keyed by priority modulo the ring size)
+    are enough to hold the whole queue. Re-adding a task doesn't move it, the stale copy
+    stays in its old bucket and has to be skipped by the caller.
+    """
+
+    def __init__(self, max_priority_step: int):
+        self.buckets: list[list[int]] = [[] for _ in range(max_priority_step + 1)]
+        # Priority of the bucket currently being drained
+        self.priority = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add_task(self, task: int, priority: int = 0) -> None:
+        self.buckets[priority % len(self.buckets)].append(task)
+        self.size += 1
+
+    def pop_task(self) -> int:
+        if not self.size:
+            raise KeyError("pop_task from an empty priority queue")
+        buckets = self.buckets
+        while not buckets[self.priority % len(buckets)]:
+            self.priority += 1
+        self.size -= 1
+        return buckets[self.priority % len(buckets)].pop()